@@ -4,103 +4,480 @@ K6 Test Results Metrics Extractor
 Extracts key performance metrics from k6 test result JSON files
 """
 
-import json
+import csv
+from array import array
 import sys
 import os
-import glob
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Sequence, Tuple
 
+import ijson
+import numpy as np
 
-def extract_cloudwatch_logs_metrics(json_file_path: str) -> List[Dict[str, Any]]:
+from metrics_io import calculate_average_metrics, save_metrics_to_file
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator used when numba is not installed"""
+        return lambda func: func
+
+
+# ijson reads the log file in chunks of this size (its default is 64 KiB)
+READ_BUFFER_SIZE = 1 << 20
+
+# Number of log messages packed and handed to the numba kernel at a time
+PARSE_BATCH_SIZE = 1 << 16
+
+# Lowercase operation names and powers of ten used by the compiled message parser
+_SERIALIZE = np.frombuffer(b'serialize', dtype=np.uint8)
+_DESERIALIZE = np.frombuffer(b'deserialize', dtype=np.uint8)
+_POW10 = np.array([10.0 ** i for i in range(23)], dtype=np.float64)
+
+
+@njit(cache=True)
+def _equals_lower(buf, start, end, word):
+    """Case-insensitive comparison of buf[start:end] with a lowercase word"""
+    if end - start != word.shape[0]:
+        return False
+    for i in range(word.shape[0]):
+        c = buf[start + i]
+        if 65 <= c <= 90:
+            c += 32
+        if c != word[i]:
+            return False
+    return True
+
+
+@njit(cache=True)
+def _is_space(c):
+    """ASCII whitespace as stripped by float(): space, \\t, \\n, \\v, \\f, \\r"""
+    return c == 32 or 9 <= c <= 13
+
+
+@njit(cache=True)
+def _parse_latency(buf, start, end):
+    """
+    Parse a plain decimal number from buf[start:end] when it can be done exactly
+    
+    Only numbers with at most 15 significant digits and a power-of-ten scale
+    within +/-22 are handled: the mantissa and the power of ten are then both
+    exact doubles, so the single multiply/divide is correctly rounded and the
+    result equals float(). Anything else (longer numbers, inf/nan, underscores,
+    invalid text) is left to float() on the Python side.
+    
+    Returns:
+        Tuple of (value, ok) where ok is False if the field must be parsed by float()
+    """
+    while start < end and _is_space(buf[start]):
+        start += 1
+    while end > start and _is_space(buf[end - 1]):
+        end -= 1
+    
+    negative = False
+    if start < end and (buf[start] == 43 or buf[start] == 45):
+        negative = buf[start] == 45
+        start += 1
+    
+    mantissa = 0
+    significant = 0
+    scale = 0
+    has_digits = False
+    seen_dot = False
+    while start < end:
+        c = int(buf[start])
+        if 48 <= c <= 57:
+            has_digits = True
+            if mantissa != 0 or c != 48:
+                significant += 1
+                if significant > 15:
+                    return 0.0, False
+            mantissa = mantissa * 10 + (c - 48)
+            if seen_dot:
+                scale -= 1
+        elif c == 46 and not seen_dot:
+            seen_dot = True
+        else:
+            break
+        start += 1
+    
+    if not has_digits:
+        return 0.0, False
+    
+    # Optional exponent (at most 3 digits)
+    if start < end and (buf[start] == 101 or buf[start] == 69):
+        start += 1
+        exp_negative = False
+        if start < end and (buf[start] == 43 or buf[start] == 45):
+            exp_negative = buf[start] == 45
+            start += 1
+        exp_start = start
+        exponent = 0
+        while start < end and 48 <= buf[start] <= 57:
+            exponent = exponent * 10 + (int(buf[start]) - 48)
+            start += 1
+        if start == exp_start or start - exp_start > 3:
+            return 0.0, False
+        scale += -exponent if exp_negative else exponent
+    
+    if start != end:
+        return 0.0, False
+    
+    value = float(mantissa)
+    if mantissa == 0:
+        pass
+    elif 0 <= scale <= 22:
+        value *= _POW10[scale]
+    elif -22 <= scale < 0:
+        value /= _POW10[-scale]
+    else:
+        return 0.0, False
+    return (-value if negative else value), True
+
+
+@njit(cache=True)
+def parse_log_messages(buf, offsets, out_serialize, out_deserialize, out_deferred):
+    """
+    Parse CSV-like log messages packed into a single byte buffer
+    
+    Message i spans buf[offsets[i]:offsets[i + 1]] and has the layout
+    "id","protocol","operation","endpoint","timestamp","latency".
+    Messages the kernel cannot parse exactly like csv.reader and float()
+    (embedded quotes or newlines, unusual latency formats) are not guessed
+    at: their indices are written to out_deferred for the Python parser.
+    
+    Args:
+        buf: uint8 array holding all messages back to back
+        offsets: int64 array of message boundaries (len = messages + 1)
+        out_serialize: Preallocated float64 array for serialize latencies
+        out_deserialize: Preallocated float64 array for deserialize latencies
+        out_deferred: Preallocated int64 array for indices of deferred messages
+        
+    Returns:
+        Tuple of (serialize count, deserialize count, malformed count, deferred count)
+    """
+    n_serialize = 0
+    n_deserialize = 0
+    n_malformed = 0
+    n_deferred = 0
+    for i in range(offsets.shape[0] - 1):
+        end = offsets[i + 1]
+        
+        # Locate the operation (3rd) and latency (6th) fields. Fields are either
+        # fully quoted without inner quotes or unquoted without any quotes.
+        field = 0
+        op_start = op_end = latency_start = latency_end = 0
+        deferred = False
+        j = offsets[i]
+        while True:
+            if j < end and buf[j] == 34:
+                content_start = j + 1
+                j = content_start
+                while j < end and buf[j] != 34:
+                    if buf[j] == 10 or buf[j] == 13:
+                        deferred = True
+                        break
+                    j += 1
+                if deferred or j == end:
+                    deferred = True
+                    break
+                content_end = j
+                j += 1
+                if j < end and buf[j] != 44:
+                    deferred = True
+                    break
+            else:
+                content_start = j
+                while j < end and buf[j] != 44:
+                    if buf[j] == 34 or buf[j] == 10 or buf[j] == 13:
+                        deferred = True
+                        break
+                    j += 1
+                if deferred:
+                    break
+                content_end = j
+            
+            if field == 2:
+                op_start, op_end = content_start, content_end
+            elif field == 5:
+                latency_start, latency_end = content_start, content_end
+            field += 1
+            
+            if j >= end:
+                break
+            j += 1  # Skip the comma
+        
+        if deferred:
+            out_deferred[n_deferred] = i
+            n_deferred += 1
+            continue
+        
+        if field < 6:
+            n_malformed += 1
+            continue
+        
+        latency, ok = _parse_latency(buf, latency_start, latency_end)
+        if not ok:
+            out_deferred[n_deferred] = i
+            n_deferred += 1
+            continue
+        
+        if _equals_lower(buf, op_start, op_end, _SERIALIZE):
+            out_serialize[n_serialize] = latency
+            n_serialize += 1
+        elif _equals_lower(buf, op_start, op_end, _DESERIALIZE):
+            out_deserialize[n_deserialize] = latency
+            n_deserialize += 1
+    
+    return n_serialize, n_deserialize, n_malformed, n_deferred
+
+
+class _MessageFeed:
+    """Single-item iterator that csv.reader can be refilled from, one message at a time"""
+    
+    __slots__ = ('message',)
+    
+    def __init__(self):
+        self.message = None
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        message = self.message
+        if message is None:
+            raise StopIteration
+        self.message = None
+        return message
+
+
+def parse_messages_csv(messages: Iterable[str]) -> Tuple[array, array, int]:
+    """
+    Split log messages into serialize and deserialize latencies using csv.reader
+    
+    Args:
+        messages: Iterable of non-empty CSV-like log messages
+        
+    Returns:
+        Tuple of (serialize latencies, deserialize latencies, malformed message count)
+    """
+    # Unboxed double arrays; the event count is unknown while streaming
+    serialize_latencies = array('d')
+    deserialize_latencies = array('d')
+    
+    n_malformed = 0
+    
+    # Parse CSV-like message: "id","protocol","operation","endpoint","timestamp","latency"
+    # csv.reader tokenizes in C and yields the fields already unquoted. The reader pulls
+    # from a feed holding exactly one message, so an unterminated quote hits the end of
+    # input instead of running into the next message.
+    feed = _MessageFeed()
+    reader = csv.reader(feed)
+    for message in messages:
+        feed.message = message
+        try:
+            parts = next(reader)
+        except (csv.Error, StopIteration):
+            n_malformed += 1
+            continue
+        
+        if len(parts) < 6:
+            n_malformed += 1
+            continue
+        
+        operation = parts[2]
+        
+        # Convert latency to float
+        try:
+            latency = float(parts[5])
+        except ValueError:
+            n_malformed += 1
+            continue
+        
+        # Store latency based on operation; logs use lowercase names, so only
+        # fall back to a case-insensitive comparison when the exact match fails
+        if operation == 'serialize':
+            serialize_latencies.append(latency)
+        elif operation == 'deserialize':
+            deserialize_latencies.append(latency)
+        else:
+            operation = operation.lower()
+            if operation == 'serialize':
+                serialize_latencies.append(latency)
+            elif operation == 'deserialize':
+                deserialize_latencies.append(latency)
+    
+    return serialize_latencies, deserialize_latencies, n_malformed
+
+
+def _parse_batch_compiled(buf: bytearray, offsets: array, out_serialize: np.ndarray,
+                          out_deserialize: np.ndarray, out_deferred: np.ndarray,
+                          serialize_latencies: array, deserialize_latencies: array) -> int:
+    """
+    Run the numba kernel on one packed batch and append its latencies to the result arrays
+    
+    Returns:
+        Number of malformed messages in the batch
+    """
+    n_serialize, n_deserialize, n_malformed, n_deferred = parse_log_messages(
+        np.frombuffer(buf, dtype=np.uint8),
+        np.frombuffer(offsets, dtype=np.int64),
+        out_serialize,
+        out_deserialize,
+        out_deferred
+    )
+    serialize_latencies.frombytes(out_serialize[:n_serialize].tobytes())
+    deserialize_latencies.frombytes(out_deserialize[:n_deserialize].tobytes())
+    
+    # Hand messages the kernel could not parse exactly to the csv/float() path
+    if n_deferred:
+        deferred_messages = (
+            buf[offsets[i]:offsets[i + 1]].decode('utf-8', 'surrogatepass') for i in out_deferred[:n_deferred]
+        )
+        extra_serialize, extra_deserialize, extra_malformed = parse_messages_csv(deferred_messages)
+        serialize_latencies.extend(extra_serialize)
+        deserialize_latencies.extend(extra_deserialize)
+        n_malformed += extra_malformed
+    
+    return n_malformed
+
+
+def parse_messages_compiled(messages: Iterable[str]) -> Tuple[array, array, int]:
+    """
+    Split log messages into serialize and deserialize latencies using the numba kernel
+    
+    Args:
+        messages: Iterable of non-empty CSV-like log messages
+        
+    Returns:
+        Tuple of (serialize latencies, deserialize latencies, malformed message count)
+    """
+    serialize_latencies = array('d')
+    deserialize_latencies = array('d')
+    n_malformed = 0
+    
+    # Kernel buffers are sized for one batch and reused, so memory does not grow with the file
+    out_serialize = np.empty(PARSE_BATCH_SIZE, dtype=np.float64)
+    out_deserialize = np.empty(PARSE_BATCH_SIZE, dtype=np.float64)
+    out_deferred = np.empty(PARSE_BATCH_SIZE, dtype=np.int64)
+    
+    # Pack each batch of messages into one buffer so the kernel never touches Python objects.
+    # Non-string messages are malformed, as they are for csv.reader.
+    buf = bytearray()
+    offsets = array('q', [0])
+    for message in messages:
+        if not isinstance(message, str):
+            n_malformed += 1
+            continue
+        buf += message.encode('utf-8', 'surrogatepass')
+        offsets.append(len(buf))
+        
+        if len(offsets) > PARSE_BATCH_SIZE:
+            n_malformed += _parse_batch_compiled(
+                buf, offsets, out_serialize, out_deserialize, out_deferred,
+                serialize_latencies, deserialize_latencies
+            )
+            del buf[:]
+            del offsets[1:]
+    
+    if len(offsets) > 1:
+        n_malformed += _parse_batch_compiled(
+            buf, offsets, out_serialize, out_deserialize, out_deferred,
+            serialize_latencies, deserialize_latencies
+        )
+    
+    return serialize_latencies, deserialize_latencies, n_malformed
+
+
+def calculate_latency_statistics(latencies: Sequence[float]) -> Dict[str, Any]:
+    """
+    Calculate latency statistics for a single operation
+    
+    Args:
+        latencies: Non-empty sequence of latency values
+        
+    Returns:
+        Dictionary containing request count and latency min/max/avg/median/percentiles
+    """
+    n = len(latencies)
+    latency_array = np.asarray(latencies, dtype=np.float64)
+    
+    # Only a handful of order statistics are needed, so partition around
+    # them (O(n) per pivot) instead of fully sorting the array
+    mid = n // 2
+    p90, p95, p99 = int(0.9 * n), int(0.95 * n), int(0.99 * n)
+    ranks = [mid, p90, p95, p99] + ([mid - 1] if n % 2 == 0 else [])
+    partitioned = np.partition(latency_array, ranks)
+    
+    if n % 2 == 1:
+        median = partitioned[mid]
+    else:
+        median = (partitioned[mid - 1] + partitioned[mid]) / 2
+    
+    return {
+        'total_requests': n,
+        'latency_min': float(latency_array.min()),
+        'latency_max': float(latency_array.max()),
+        'latency_avg': float(latency_array.mean()),
+        'latency_median': float(median),
+        'latency_p90': float(partitioned[p90]),
+        'latency_p95': float(partitioned[p95]),
+        'latency_p99': float(partitioned[p99])
+    }
+
+
+def extract_cloudwatch_logs_metrics(json_file_path: str, strict: bool = False) -> List[Dict[str, Any]]:
     """
     Extract latency metrics from CloudWatch logs JSON file, separated by operation
     
     Args:
         json_file_path: Path to the CloudWatch logs JSON file
+        strict: Raise ValueError if any log message is malformed instead of skipping it
         
     Returns:
         Dictionary containing extracted latency metrics separated by operation
     """
+    # Extract latency values from log messages, separated by operation.
+    # Events are streamed and parsed one message (csv) or one fixed-size batch (numba)
+    # at a time, so only the unboxed latency arrays grow with the size of the dump.
+    parse_messages = parse_messages_compiled if HAS_NUMBA else parse_messages_csv
     try:
-        with open(json_file_path, 'r') as file:
-            data = json.load(file)
+        with open(json_file_path, 'rb') as file:
+            events = ijson.items(file, 'events.item', use_float=True, buf_size=READ_BUFFER_SIZE)
+            messages = (event.get('message', '') for event in events)
+            serialize_latencies, deserialize_latencies, n_malformed = parse_messages(
+                message for message in messages if message
+            )
     except FileNotFoundError:
         print(f"Error: File '{json_file_path}' not found")
         return {}
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         print(f"Error: Invalid JSON in file '{json_file_path}'")
         return {}
     
-    if 'events' not in data:
-        print(f"Error: No 'events' found in file '{json_file_path}'")
-        return {}
+    # Malformed messages are tallied during parsing and reported once per file
+    if n_malformed:
+        if strict:
+            raise ValueError(f"{n_malformed} malformed messages in '{json_file_path}'")
+        print(f"Warning: Skipped {n_malformed} malformed messages in '{json_file_path}'")
     
-    # Extract latency values from log messages, separated by operation
-    serialize_latencies = []
-    deserialize_latencies = []    
-    for event in data['events']:
-        message = event.get('message', '')
-        if not message:
-            continue
-            
-        # Parse CSV-like message: "id","protocol","operation","endpoint","timestamp","latency"
-        try:
-            # Remove quotes and split by comma
-            parts = [part.strip('"') for part in message.split(',')]
-            if len(parts) >= 6:
-                request_id, protocol, operation, endpoint, timestamp, latency_str = parts[:6]
-                
-                # Convert latency to float
-                try:
-                    latency = float(latency_str)
-                    
-                    # Store latency based on operation
-                    if operation.lower() == 'serialize':
-                        serialize_latencies.append(latency)
-                    elif operation.lower() == 'deserialize':
-                        deserialize_latencies.append(latency)
-                except ValueError:
-                    print(f"Warning: Invalid latency value: {latency_str}")
-                    continue  # Skip invalid latency values
-        except Exception:
-            print(f"Warning: Malformed message: {message}")
-            continue  # Skip malformed messages            
-    
-    if not serialize_latencies and not deserialize_latencies:
+    if not len(serialize_latencies) and not len(deserialize_latencies):
         print(f"Warning: No valid latency data found in '{json_file_path}'")
         return []
     
     metrics = {}
     
     # Calculate statistics for serialize operation
-    if serialize_latencies:
-        serialize_latencies.sort()
-        n_serialize = len(serialize_latencies)
-        metrics['serialize'] = {
-            'total_requests': n_serialize,
-            'latency_min': serialize_latencies[0],
-            'latency_max': serialize_latencies[-1],
-            'latency_avg': sum(serialize_latencies) / n_serialize,
-            'latency_median': serialize_latencies[n_serialize // 2] if n_serialize % 2 == 1 else (serialize_latencies[n_serialize // 2 - 1] + serialize_latencies[n_serialize // 2]) / 2,
-            'latency_p90': serialize_latencies[int(0.9 * n_serialize)] if n_serialize > 0 else 0,
-            'latency_p95': serialize_latencies[int(0.95 * n_serialize)] if n_serialize > 0 else 0,
-            'latency_p99': serialize_latencies[int(0.99 * n_serialize)] if n_serialize > 0 else 0
-        }
+    if len(serialize_latencies):
+        metrics['serialize'] = calculate_latency_statistics(serialize_latencies)
     
     # Calculate statistics for deserialize operation
-    if deserialize_latencies:
-        deserialize_latencies.sort()
-        n_deserialize = len(deserialize_latencies)
-        metrics['deserialize'] = {
-            'total_requests': n_deserialize,
-            'latency_min': deserialize_latencies[0],
-            'latency_max': deserialize_latencies[-1],
-            'latency_avg': sum(deserialize_latencies) / n_deserialize,
-            'latency_median': deserialize_latencies[n_deserialize // 2] if n_deserialize % 2 == 1 else (deserialize_latencies[n_deserialize // 2 - 1] + deserialize_latencies[n_deserialize // 2]) / 2,
-            'latency_p90': deserialize_latencies[int(0.9 * n_deserialize)] if n_deserialize > 0 else 0,
-            'latency_p95': deserialize_latencies[int(0.95 * n_deserialize)] if n_deserialize > 0 else 0,
-            'latency_p99': deserialize_latencies[int(0.99 * n_deserialize)] if n_deserialize > 0 else 0
-        }
+    if len(deserialize_latencies):
+        metrics['deserialize'] = calculate_latency_statistics(deserialize_latencies)
         
     return [
         metrics['deserialize'],
@@ -108,128 +485,111 @@ def extract_cloudwatch_logs_metrics(json_file_path: str) -> List[Dict[str, Any]]
     ]
 
 
-def save_metrics_to_file(metrics: Dict[str, Any], output_file: str):
-    """
-    Save extracted metrics to a JSON file
-    
-    Args:
-        metrics: Dictionary of extracted metrics
-        output_file: Output file path
-    """
-    try:
-        with open(output_file, 'w') as file:
-            json.dump(metrics, file, indent=2)
-        print(f"Metrics saved to: {output_file}")
-    except Exception as e:
-        print(f"Error saving metrics: {e}")
-
-
-def calculate_average_metrics(all_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+def find_cloudwatch_logs_files(service_dir: str, service: str) -> List[str]:
     """
-    Calculate average metrics across all files (primitive values only)
+    Find CloudWatch logs files named run_*_<service>_cloudwatch_logs.json in a service folder
     
     Args:
-        all_metrics: List containing metrics from all files
+        service_dir: Path to the service folder
+        service: Service name used in the file names
         
     Returns:
-        Dictionary containing averaged metrics
+        List of matching file paths
     """
-    if not all_metrics:
-        return {}
+    prefix = 'run_'
+    suffix = f'_{service}_cloudwatch_logs.json'
     
-    # Initialize counters and sums
-    counters = {}
-    sums = {}
-    
-    # Process each file's metrics
-    for metrics in all_metrics:
-        for metric_key, metric_value in metrics.items():
-            if metric_key not in counters:
-                counters[metric_key] = 0
-                sums[metric_key] = 0
-            
-            counters[metric_key] += 1
-            sums[metric_key] += metric_value
-    
-    # Calculate averages
-    average_metrics = {}
-    for metric_key in counters:
-        if counters[metric_key] > 0:
-            average_metrics[metric_key] = sums[metric_key] / counters[metric_key]
-    
-    return average_metrics
+    # Plain prefix/suffix checks on a single directory scan instead of glob's fnmatch
+    with os.scandir(service_dir) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.startswith(prefix)
+            and entry.name.endswith(suffix)
+            and len(entry.name) >= len(prefix) + len(suffix)
+            and entry.is_file()
+        ]
 
 
-def process_cloudwatch_logs(folder_path: str, output_file: str):
+def process_cloudwatch_logs(folder_path: str, output_file: str, strict: bool = False):
     """
     Process all CloudWatch logs files in service subdirectories and save per-service results
     
     Args:
         folder_path: Path to the folder containing service subdirectories
         output_file: Name of the output file for average metrics
+        strict: Reject files containing malformed log messages instead of skipping those messages
     """
-    if not os.path.isdir(folder_path):
-        print(f"Error: '{folder_path}' is not a valid directory")
-        sys.exit(1)
-    
     # Look for service subdirectories
     services = ['order', 'product', 'user', 'payment']
     all_service_metrics = {}
+    total_files = 0
     
-    for service in services:
-        service_dir = os.path.join(folder_path, service)
-        if not os.path.exists(service_dir):
-            continue
-            
-        print(f"\nProcessing {service} service...")
-        
-        # Find all CloudWatch logs files for this service
-        pattern = os.path.join(service_dir, f"run_*_{service}_cloudwatch_logs.json")
-        matching_files = glob.glob(pattern)
-        
-        if not matching_files:
-            print(f"  No CloudWatch logs files found for {service} service")
-            continue
+    # One worker pool for the whole run; each file is parsed independently
+    with ProcessPoolExecutor() as executor:
+        # Submit the files of every service up front so workers never sit idle between services
+        service_futures = {}
+        for service in services:
+            service_dir = os.path.join(folder_path, service)
+            if not os.path.exists(service_dir):
+                continue
+                
+            print(f"\nProcessing {service} service...")
             
-        print(f"  Found {len(matching_files)} CloudWatch logs files for {service} service:")
-        
-        # Process each file for this service
-        all_deserialize_metrics = []
-        all_serialize_metrics = []
-        
-        for file_path in matching_files:
-            file_name = os.path.basename(file_path)
-            print(f"    Processing: {file_name}")
+            # Find all CloudWatch logs files for this service
+            matching_files = find_cloudwatch_logs_files(service_dir, service)
             
-            # Extract metrics
-            try:
-                [deserialize_metrics, serialize_metrics] = extract_cloudwatch_logs_metrics(file_path)
-                
-                if deserialize_metrics and serialize_metrics:
-                    all_deserialize_metrics.append(deserialize_metrics)
-                    all_serialize_metrics.append(serialize_metrics)
-                else:
-                    print(f"      Failed to extract metrics from {file_name}")
-            except Exception as e:
-                print(f"      Error processing {file_name}: {e}")
+            if not matching_files:
+                print(f"  No CloudWatch logs files found for {service} service")
                 continue
+                
+            print(f"  Found {len(matching_files)} CloudWatch logs files for {service} service:")
+            total_files += len(matching_files)
+            
+            service_futures[service] = []
+            for file_path in matching_files:
+                print(f"    Processing: {os.path.basename(file_path)}")
+                future = executor.submit(extract_cloudwatch_logs_metrics, file_path, strict)
+                service_futures[service].append((file_path, future))
         
-        # Calculate averages for this service
-        if all_deserialize_metrics and all_serialize_metrics:
-            average_deserialize_metrics = calculate_average_metrics(all_deserialize_metrics)
-            average_serialize_metrics = calculate_average_metrics(all_serialize_metrics)
+        for service, futures in service_futures.items():
+            service_dir = os.path.join(folder_path, service)
+            print(f"\nResults for {service} service:")
             
-            all_service_metrics[service] = {
-                'deserialize': average_deserialize_metrics,
-                'serialize': average_serialize_metrics
-            }
+            all_deserialize_metrics = []
+            all_serialize_metrics = []
             
-            # Save per-service metrics
-            service_output = os.path.join(service_dir, "cloudwatch_logs_metrics.json")
-            save_metrics_to_file(all_service_metrics[service], service_output)
-            print(f"  📁 {service} service metrics saved to: {service_output}")
-        else:
-            print(f"  ⚠️  No valid metrics extracted for {service} service")
+            for file_path, future in futures:
+                file_name = os.path.basename(file_path)
+                
+                # Collect extracted metrics
+                try:
+                    [deserialize_metrics, serialize_metrics] = future.result()
+                    
+                    if deserialize_metrics and serialize_metrics:
+                        all_deserialize_metrics.append(deserialize_metrics)
+                        all_serialize_metrics.append(serialize_metrics)
+                    else:
+                        print(f"    Failed to extract metrics from {file_name}")
+                except Exception as e:
+                    print(f"    Error processing {file_name}: {e}")
+                    continue
+            
+            # Calculate averages for this service
+            if all_deserialize_metrics and all_serialize_metrics:
+                average_deserialize_metrics = calculate_average_metrics(all_deserialize_metrics)
+                average_serialize_metrics = calculate_average_metrics(all_serialize_metrics)
+                
+                all_service_metrics[service] = {
+                    'deserialize': average_deserialize_metrics,
+                    'serialize': average_serialize_metrics
+                }
+                
+                # Save per-service metrics
+                service_output = os.path.join(service_dir, "cloudwatch_logs_metrics.json")
+                save_metrics_to_file(all_service_metrics[service], service_output)
+                print(f"  📁 {service} service metrics saved to: {service_output}")
+            else:
+                print(f"  ⚠️  No valid metrics extracted for {service} service")
     
     # Save combined metrics for all services
     if all_service_metrics:
@@ -237,8 +597,6 @@ def process_cloudwatch_logs(folder_path: str, output_file: str):
         save_metrics_to_file(all_service_metrics, combined_output)
         print(f"\n📁 Combined metrics for all services saved to: {combined_output}")
         
-        total_files = sum(len(glob.glob(os.path.join(folder_path, service, f"run_*_{service}_cloudwatch_logs.json"))) 
-                         for service in services if os.path.exists(os.path.join(folder_path, service)))
         print(f"Total CloudWatch logs files processed: {total_files}")
         
         return all_service_metrics
@@ -248,17 +606,18 @@ def process_cloudwatch_logs(folder_path: str, output_file: str):
 def main():
     """Main function to process command line arguments and extract metrics"""
     if len(sys.argv) < 2:
-        print("WRONG USAGE: python extract_cloudwatch_logs.py <folder_path>")
+        print("WRONG USAGE: python extract_cloudwatch_logs.py <folder_path> [--strict]")
         sys.exit(1)
     
     folder_path = sys.argv[1]
+    strict = '--strict' in sys.argv[2:]
 
     if not os.path.isdir(folder_path):
         print(f"Error: '{folder_path}' is not a valid directory")
         sys.exit(1)
 
     # Process CloudWatch logs
-    result = process_cloudwatch_logs(folder_path, "average_cloudwatch_logs_metrics.json")
+    result = process_cloudwatch_logs(folder_path, "average_cloudwatch_logs_metrics.json", strict)
 
     if result:
         print("CloudWatch logs extraction completed successfully")
@@ -8,7 +8,8 @@ import json
 import sys
 import os
 import glob
-from typing import Dict, Any, List
+
+from metrics_io import save_metrics_to_file
 
 
 def extract_cpu_metrics(json_file_path: str) -> float:
@@ -163,22 +164,6 @@ def extract_network_tx_metrics(json_file_path: str) -> float:
     return sum(max_values) / len(max_values)
 
 
-def save_metrics_to_file(metrics: Dict[str, Any], output_file: str):
-    """
-    Save extracted metrics to a JSON file
-    
-    Args:
-        metrics: Dictionary of extracted metrics
-        output_file: Output file path
-    """
-    try:
-        with open(output_file, 'w') as file:
-            json.dump(metrics, file, indent=2)
-        print(f"Metrics saved to: {output_file}")
-    except Exception as e:
-        print(f"Error saving metrics: {e}")
-
-
 def process_cloudwatch_metrics(folder_path: str, output_file: str):
     """
     Process all CloudWatch metrics files in a folder
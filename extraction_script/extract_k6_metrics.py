@@ -7,9 +7,88 @@ Extracts key performance metrics from k6 test result JSON files
 import json
 import sys
 import os
-import glob
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from metrics_io import calculate_average_metrics, save_metrics_to_file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Static extraction table: (sources, fields)
+#   sources: candidate (k6 metric, required k6 metric) pairs, the first one present wins.
+#            The required metric gates protocol-specific sources (REST vs gRPC).
+#   fields:  (k6 value key, output metric name) pairs copied from the chosen source
+FIELD_MAP = (
+    # Data sent and received
+    ((('data_sent', None),), (
+        ('count', 'data_sent_count'),
+        ('rate', 'data_sent_rate'),
+    )),
+    ((('data_received', None),), (
+        ('count', 'data_received_count'),
+        ('rate', 'data_received_rate'),
+    )),
+    # Request duration (REST or gRPC)
+    ((('http_req_duration', None), ('grpc_req_duration', None)), (
+        ('avg', 'request_duration_avg'),
+        ('min', 'request_duration_min'),
+        ('max', 'request_duration_max'),
+        ('med', 'request_duration_median'),
+        ('p(90)', 'request_duration_p90'),
+        ('p(95)', 'request_duration_p95'),
+        ('p(99)', 'request_duration_p99'),
+    )),
+    # VUs (Virtual Users) max
+    ((('vus_max', None),), (
+        ('value', 'vus_max'),
+    )),
+    # Throughput (requests per second) - for gRPC, iterations are the throughput equivalent
+    ((('http_reqs', 'http_req_duration'), ('iterations', 'grpc_req_duration')), (
+        ('rate', 'throughput_requests_per_second'),
+        ('count', 'throughput_total_requests'),
+    )),
+    # Success rate from checks
+    ((('checks', None),), (
+        ('rate', 'success_rate_rate'),
+        ('passes', 'success_rate_passes'),
+        ('fails', 'success_rate_fails'),
+    )),
+)
+
+def build_field_extractor(field_map) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Generate a specialized extraction function for a static field table
+    
+    The table is unrolled into straight-line code so every metric name and
+    value key is a constant in the generated function's bytecode.
+    
+    Args:
+        field_map: Extraction table with the same layout as FIELD_MAP
+        
+    Returns:
+        Function mapping a k6 'metrics' dict to the flattened metrics dict
+    """
+    lines = ["def _extract_fields(k6_metrics):", "    metrics = {}"]
+    for sources, fields in field_map:
+        for index, (source, required) in enumerate(sources):
+            condition = f"{source!r} in k6_metrics"
+            if required:
+                condition += f" and {required!r} in k6_metrics"
+            lines.append(f"    {'if' if index == 0 else 'elif'} {condition}:")
+            lines.append(f"        values = k6_metrics[{source!r}].get('values') or {{}}")
+            for value_key, output_key in fields:
+                lines.append(f"        metrics[{output_key!r}] = values.get({value_key!r}, 0)")
+    lines.append("    return metrics")
+    
+    namespace = {}
+    exec(compile("\n".join(lines), "<k6 field extractor>", "exec"), namespace)
+    return namespace['_extract_fields']
+
+_extract_fields = build_field_extractor(FIELD_MAP)
 
 def extract_k6_metrics(json_file_path: str) -> Dict[str, Any]:
     """
@@ -22,8 +101,9 @@ def extract_k6_metrics(json_file_path: str) -> Dict[str, Any]:
         Dictionary containing extracted metrics (flattened structure)
     """
     try:
-        with open(json_file_path, 'r') as file:
-            data = json.load(file)
+        with open(json_file_path, 'rb') as file:
+            raw = file.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
     except FileNotFoundError:
         print(f"Error: File '{json_file_path}' not found")
         return {}
@@ -31,169 +111,75 @@ def extract_k6_metrics(json_file_path: str) -> Dict[str, Any]:
         print(f"Error: Invalid JSON in file '{json_file_path}'")
         return {}
     
-    metrics = {}
-    
-    # Detect protocol type (REST vs gRPC)
-    is_grpc = 'grpc_req_duration' in data.get('metrics', {})
-    is_rest = 'http_req_duration' in data.get('metrics', {})
-    
-    # Extract data_sent and data_received
-    if 'data_sent' in data.get('metrics', {}):
-        data_sent = data['metrics']['data_sent']
-        metrics['data_sent_count'] = data_sent.get('values', {}).get('count', 0)
-        metrics['data_sent_rate'] = data_sent.get('values', {}).get('rate', 0)
-    
-    if 'data_received' in data.get('metrics', {}):
-        data_received = data['metrics']['data_received']
-        metrics['data_received_count'] = data_received.get('values', {}).get('count', 0)
-        metrics['data_received_rate'] = data_received.get('values', {}).get('rate', 0)
-    
-    # Extract request duration metrics (REST or gRPC)
-    if is_rest and 'http_req_duration' in data.get('metrics', {}):
-        req_duration = data['metrics']['http_req_duration']
-        metrics['request_duration_avg'] = req_duration.get('values', {}).get('avg', 0)
-        metrics['request_duration_min'] = req_duration.get('values', {}).get('min', 0)
-        metrics['request_duration_max'] = req_duration.get('values', {}).get('max', 0)
-        metrics['request_duration_median'] = req_duration.get('values', {}).get('med', 0)
-        metrics['request_duration_p90'] = req_duration.get('values', {}).get('p(90)', 0)
-        metrics['request_duration_p95'] = req_duration.get('values', {}).get('p(95)', 0)
-        metrics['request_duration_p99'] = req_duration.get('values', {}).get('p(99)', 0)
-    elif is_grpc and 'grpc_req_duration' in data.get('metrics', {}):
-        req_duration = data['metrics']['grpc_req_duration']
-        metrics['request_duration_avg'] = req_duration.get('values', {}).get('avg', 0)
-        metrics['request_duration_min'] = req_duration.get('values', {}).get('min', 0)
-        metrics['request_duration_max'] = req_duration.get('values', {}).get('max', 0)
-        metrics['request_duration_median'] = req_duration.get('values', {}).get('med', 0)
-        metrics['request_duration_p90'] = req_duration.get('values', {}).get('p(90)', 0)
-        metrics['request_duration_p95'] = req_duration.get('values', {}).get('p(95)', 0)
-        metrics['request_duration_p99'] = req_duration.get('values', {}).get('p(99)', 0)
-    
-    # Extract VUs (Virtual Users) max
-    if 'vus_max' in data.get('metrics', {}):
-        vus_max = data['metrics']['vus_max']
-        metrics['vus_max'] = vus_max.get('values', {}).get('value', 0)
-    
-    # Extract throughput (requests per second) - REST or gRPC
-    if is_rest and 'http_reqs' in data.get('metrics', {}):
-        http_reqs = data['metrics']['http_reqs']
-        metrics['throughput_requests_per_second'] = http_reqs.get('values', {}).get('rate', 0)
-        metrics['throughput_total_requests'] = http_reqs.get('values', {}).get('count', 0)
-    elif is_grpc and 'iterations' in data.get('metrics', {}):
-        # For gRPC, use iterations as throughput equivalent
-        iterations = data['metrics']['iterations']
-        metrics['throughput_requests_per_second'] = iterations.get('values', {}).get('rate', 0)
-        metrics['throughput_total_requests'] = iterations.get('values', {}).get('count', 0)
-    
-    # Extract success rate from checks
-    if 'checks' in data.get('metrics', {}):
-        checks = data['metrics']['checks']
-        metrics['success_rate_rate'] = checks.get('values', {}).get('rate', 0)
-        metrics['success_rate_passes'] = checks.get('values', {}).get('passes', 0)
-        metrics['success_rate_fails'] = checks.get('values', {}).get('fails', 0)
-    
-    return metrics
-
-def save_metrics_to_file(metrics: Dict[str, Any], output_file: str):
-    """
-    Save extracted metrics to a JSON file
-    
-    Args:
-        metrics: Dictionary of extracted metrics
-        output_file: Output file path
-    """
-    try:
-        with open(output_file, 'w') as file:
-            json.dump(metrics, file, indent=2)
-        print(f"Metrics saved to: {output_file}")
-    except Exception as e:
-        print(f"Error saving metrics: {e}")
+    return _extract_fields(data.get('metrics') or {})
 
-def calculate_average_metrics(all_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+def find_k6_result_files(folder_path: str) -> List[str]:
     """
-    Calculate average metrics across all files
+    Find k6 result files named results_*_run_*.json in a folder
     
     Args:
-        all_metrics: List containing metrics from all files
+        folder_path: Path to the folder containing k6 result files
         
     Returns:
-        Dictionary containing averaged metrics
+        List of matching file paths
     """
-    if not all_metrics:
-        print("No metrics to average")
-        raise Exception("No metrics to average")
-    
-    # Initialize counters and sums
-    counters = {}
-    sums = {}
-    
-    # Process each file's metrics
-    for metrics in all_metrics:
-        for metric_key, metric_value in metrics.items():
-            if metric_key not in counters:
-                counters[metric_key] = 0
-                sums[metric_key] = 0
-            
-            counters[metric_key] += 1
-            sums[metric_key] += metric_value
-    
-    # Calculate averages
-    average_metrics = {}
-    for metric_key in counters:
-        if counters[metric_key] > 0:
-            average_metrics[metric_key] = sums[metric_key] / counters[metric_key]
-    
-    return average_metrics
+    # Plain prefix/suffix checks on a single directory scan instead of glob's fnmatch
+    with os.scandir(folder_path) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.startswith('results_')
+            and entry.name.endswith('.json')
+            and '_run_' in entry.name[len('results_'):-len('.json')]
+            and entry.is_file()
+        ]
 
-def process_k6_metrics(folder_path: str, output_file: str):
+def process_k6_metrics(folder_path: str, output_file: str) -> Tuple[Dict[str, Any], int]:
     """
     Process all k6 result files in a folder that match the pattern results_*_run_*.json
     
     Args:
         folder_path: Path to the folder containing k6 result files
         output_file: Name of the output file for average metrics
+        
+    Returns:
+        Tuple of (averaged metrics, number of matching files)
     """
-    if not os.path.isdir(folder_path):
-        print(f"Error: '{folder_path}' is not a valid directory")
-        sys.exit(1)
-    
     if not output_file:
         print("Error: Output file is required")
         sys.exit(1)
     
     # Find all files matching the pattern
-    pattern = os.path.join(folder_path, "results_*_run_*.json")
-    matching_files = glob.glob(pattern)
+    matching_files = find_k6_result_files(folder_path)
     
     if not matching_files:
         print(f"No files found matching pattern 'results_*_run_*.json' in {folder_path}")
-        return {}
+        return {}, 0
     
     print(f"Found {len(matching_files)} k6 result files to process:")
     
-    # Process each file
+    # Process files in parallel; each file is parsed independently
     all_metrics = []
-    for file_path in matching_files:
-        file_name = os.path.basename(file_path)
-        print(f"\nProcessing k6 file: {file_name}")
-        
-        # Extract metrics
-        metrics = extract_k6_metrics(file_path)
-        
-        if not metrics:
-            print(f"Failed to extract metrics from {file_name}")
-            continue
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(extract_k6_metrics, matching_files, chunksize=4)
+        for file_path, metrics in zip(matching_files, results):
+            file_name = os.path.basename(file_path)
+            print(f"\nProcessing k6 file: {file_name}")
+            
+            if not metrics:
+                print(f"Failed to extract metrics from {file_name}")
+                continue
 
-        all_metrics.append(metrics)
+            all_metrics.append(metrics)
     
     # Save combined metrics
     if len(all_metrics) <= 0:
         print("No k6 metrics extracted")
-        return {}
+        return {}, len(matching_files)
         
     # Calculate and save average metrics
     average_metrics = calculate_average_metrics(all_metrics)
 
-    return average_metrics
+    return average_metrics, len(matching_files)
 
 def run_k6_metrics_extraction(folder_path: str):
     """Main function to process command line arguments and extract metrics"""
@@ -208,17 +194,13 @@ def run_k6_metrics_extraction(folder_path: str):
         sys.exit(1)
 
     # Folder processing
-    average_metrics = process_k6_metrics(folder_path, "average_k6_metrics.json")
+    average_metrics, file_count = process_k6_metrics(folder_path, "average_k6_metrics.json")
 
     if average_metrics:
         average_output = os.path.join(folder_path, "average_k6_metrics.json")
         save_metrics_to_file(average_metrics, average_output)
         print(f"Average k6 metrics saved to: {average_output}")
-        
-        # Count processed files for summary
-        pattern = os.path.join(folder_path, "results_*_run_*.json")
-        matching_files = glob.glob(pattern)
-        print(f"Processed {len(matching_files)} k6 files successfully")
+        print(f"Processed {file_count} k6 files successfully")
     else:
         print("No k6 metrics extracted")
 
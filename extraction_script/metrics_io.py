@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Metrics File Helpers
+Shared JSON output and averaging helpers for the extraction scripts
+"""
+
+import json
+from typing import Dict, Any, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _to_builtin(obj: Any) -> Any:
+    """Convert NumPy scalars and arrays for the stdlib json fallback"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_json(obj: Any, output_file: str):
+    """
+    Write an object to a JSON file with 2-space indentation
+    
+    Args:
+        obj: JSON-serializable object (NumPy scalars and arrays are allowed)
+        output_file: Output file path
+    """
+    if orjson:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data = json.dumps(obj, indent=2, default=_to_builtin).encode('utf-8')
+    
+    with open(output_file, 'wb') as file:
+        file.write(data)
+
+
+def save_metrics_to_file(metrics: Dict[str, Any], output_file: str):
+    """
+    Save extracted metrics to a JSON file
+    
+    Args:
+        metrics: Dictionary of extracted metrics
+        output_file: Output file path
+    """
+    try:
+        save_json(metrics, output_file)
+        print(f"Metrics saved to: {output_file}")
+    except Exception as e:
+        print(f"Error saving metrics: {e}")
+
+
+def calculate_average_metrics(all_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Calculate average metrics across all files (primitive values only)
+    
+    Args:
+        all_metrics: List containing metrics from all files
+        
+    Returns:
+        Dictionary containing averaged metrics
+    """
+    # Imported here so scripts that only save metrics do not need numpy
+    import numpy as np
+    
+    if not all_metrics:
+        return {}
+    
+    # Lay the metrics out as a (files x metrics) matrix; files missing a metric get NaN
+    metric_keys = list(dict.fromkeys(key for metrics in all_metrics for key in metrics))
+    values = np.array(
+        [[metrics.get(key, np.nan) for key in metric_keys] for metrics in all_metrics],
+        dtype=np.float64
+    )
+    
+    # Average each metric over the files that reported it
+    averages = np.nanmean(values, axis=0)
+    
+    return dict(zip(metric_keys, averages.tolist()))
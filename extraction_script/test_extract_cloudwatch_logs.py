@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+CloudWatch Logs Parser Checks
+Verifies the compiled message parser against float() and the csv.reader path
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+import extract_cloudwatch_logs as logs
+
+
+LATENCY_EDGE_CASES = [
+    '12.5', ' 7 ', '12.5\n', '12.5\t', '\x0b3\x0c', '-0', '+.5', '.5', '5.', '.',
+    '1e5', '1E-5', '1e', '1e+', '1e400', '1e-400', '1_000', 'inf', '-inf', 'nan',
+    'abc', '', '1.2.3', '1e5x', '0.0000000000000000000000001', '1' * 30, '0' * 30 + '1',
+    '93914.91627785105',
+]
+
+
+def random_latencies(count: int, seed: int = 0):
+    """Latency strings in the formats seen in logs (repr, fixed, scientific)"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        value = rng.random() * rng.choice([1, 10, 1000, 1e5, 1e-3])
+        values.append(rng.choice([
+            repr(value),
+            f'{value:.{rng.randint(0, 16)}f}',
+            f'{value:e}',
+            f'{value:.15g}',
+        ]))
+    return values
+
+
+def make_message(index: int, operation: str, latency: str) -> str:
+    return f'"{index}","rest","{operation}","/orders","2024-01-01T00:00:00Z","{latency}"'
+
+
+class ParseLatencyTest(unittest.TestCase):
+
+    def test_fast_path_matches_float(self):
+        for text in random_latencies(50000) + LATENCY_EDGE_CASES:
+            buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+            value, ok = logs._parse_latency(buf, 0, buf.shape[0])
+            if not ok:
+                continue  # Deferred to float() on the Python side
+            expected = float(text)
+            self.assertEqual(value, expected, text)
+            self.assertEqual(np.signbit(value), np.signbit(expected), text)
+
+
+class ParseMessagesTest(unittest.TestCase):
+
+    def assert_same_results(self, messages):
+        csv_serialize, csv_deserialize, csv_malformed = logs.parse_messages_csv(messages)
+        jit_serialize, jit_deserialize, jit_malformed = logs.parse_messages_compiled(messages)
+
+        self.assertEqual(csv_malformed, jit_malformed)
+        np.testing.assert_array_equal(np.sort(np.asarray(csv_serialize)), np.sort(jit_serialize))
+        np.testing.assert_array_equal(np.sort(np.asarray(csv_deserialize)), np.sort(jit_deserialize))
+
+    def test_compiled_matches_csv(self):
+        rng = random.Random(1)
+        latencies = random_latencies(20000, seed=2) + LATENCY_EDGE_CASES
+        messages = [
+            make_message(i, rng.choice(['serialize', 'Deserialize', 'SERIALIZE', 'other']), latency)
+            for i, latency in enumerate(latencies)
+        ]
+        self.assert_same_results(messages)
+
+    def test_compiled_matches_csv_on_malformed_messages(self):
+        self.assert_same_results([
+            '"abc,1,2,3,4,5',
+            make_message(1, 'serialize', '12.5'),
+            'a,b,serialize,d,e,3.5',
+            '"1","rest","serialize","/a"x,"t","1"',
+            '"a""b","rest","serialize","/a","t","2"',
+            'ab"c,rest,serialize,/a,t,4',
+            '"1","rest","serialize","/a\nb","t","5"',
+            '1,2',
+            5,
+            '"\ud800","rest","serialize","/a","t","6"',
+            '"1","rest","serialize","/a","t","7\ud800"',
+        ])
+
+    def test_compiled_matches_csv_across_batches(self):
+        batch_size = logs.PARSE_BATCH_SIZE
+        logs.PARSE_BATCH_SIZE = 7
+        try:
+            latencies = random_latencies(500, seed=3) + LATENCY_EDGE_CASES
+            self.assert_same_results([
+                make_message(i, 'serialize' if i % 3 else 'deserialize', latency)
+                for i, latency in enumerate(latencies)
+            ])
+        finally:
+            logs.PARSE_BATCH_SIZE = batch_size
+
+    def test_unterminated_quote_does_not_swallow_next_message(self):
+        serialize, _, malformed = logs.parse_messages_csv([
+            '"abc,1,2,3,4,5',
+            make_message(1, 'serialize', '12.5'),
+        ])
+        self.assertEqual(list(serialize), [12.5])
+        self.assertEqual(malformed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()